@@ -13,6 +13,27 @@ import logging
 import uuid
 import pathlib
 
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
+
+#
+# multipart settings for S3 transfers; files larger than the
+# threshold are sent as concurrent multipart PUTs, and fetched
+# as concurrent ranged GETs:
+#
+transfer_config = TransferConfig(multipart_threshold=8 * 1024 * 1024,
+                                 multipart_chunksize=8 * 1024 * 1024,
+                                 max_concurrency=10,
+                                 use_threads=True)
+
+#
+# default # of files upload_files() sends at the same time; each
+# may use up to transfer_config.max_concurrency connections, so
+# the S3 client's connection pool should hold this many:
+#
+upload_workers = 8
+max_pool_connections = upload_workers * transfer_config.max_concurrency
+
 
 ###################################################################
 #
@@ -20,14 +41,16 @@ import pathlib
 #
 # ref: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/bucket/download_file.html
 #
-def download_file(bucket, key):
+def download_file(bucket, key, filename=None):
   """
   Downloads a file from an S3 bucket
 
   Parameters
   ----------
   bucket : S3 bucket to download from, 
-  key : object's name in bucket
+  key : object's name in bucket,
+  filename : optional local filename to save as; if omitted, a
+             unique filename is generated
   
   Returns
   -------
@@ -35,16 +58,17 @@ def download_file(bucket, key):
   """
 
   try:
-    #
-    # generate a unique filename:
-    #
-    filename = str(uuid.uuid4())
-    extension = pathlib.Path(key).suffix
-    filename += extension
+    if filename is None:
+      #
+      # generate a unique filename:
+      #
+      filename = str(uuid.uuid4())
+      extension = pathlib.Path(key).suffix
+      filename += extension
     #
     # downoad:
     #
-    bucket.download_file(key, filename)
+    bucket.download_file(key, filename, Config=transfer_config)
     #
     return filename
 
@@ -54,6 +78,38 @@ def download_file(bucket, key):
     return None
 
 
+###################################################################
+#
+# count_objects
+#
+# ref: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+#
+def count_objects(bucket):
+  """
+  Counts the objects in an S3 bucket, summing the KeyCount of
+  each page of results rather than building an object summary
+  for every asset
+
+  Parameters
+  ----------
+  bucket : S3 bucket to count
+  
+  Returns
+  -------
+  # of objects in the bucket or -1 upon an error
+  """
+
+  try:
+    paginator = bucket.meta.client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=bucket.name)
+    return sum(page.get('KeyCount', 0) for page in pages)
+
+  except Exception as e:
+    logging.error("awss3.count_objects() failed:")
+    logging.error(e)
+    return -1
+
+
 ###################################################################
 #
 # upload_file
@@ -77,20 +133,92 @@ def upload_file(local_filename, bucket, key):
   """
 
   try:
-    if key.endswith('jpg'):  # image file
-      content_type = 'image/jpeg'
-    else:  # default:
-      content_type = 'application/octet-stream'
-
-    bucket.upload_file(local_filename,
-                       key,
-                       ExtraArgs={
-                         'ACL': 'public-read',
-                         'ContentType': content_type
-                       })
+    put_file(bucket.meta.client, bucket.name, local_filename, key)
     return key
 
   except Exception as e:
     logging.error("awss3.upload_file() failed:")
     logging.error(e)
     return None
+
+
+###################################################################
+#
+# put_file
+#
+# ref: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_file.html
+#
+def put_file(client, bucket_name, local_filename, key):
+  """
+  Uploads a file to an S3 bucket through an S3 client, as
+  upload_file() does; clients (unlike bucket resources) can be
+  shared between threads. Errors are raised, not logged.
+
+  Parameters
+  ----------
+  client : S3 client to upload with,
+  bucket_name : name of S3 bucket to upload to,
+  local_filename : name of local file to upload, 
+  key : object's name in the bucket after upload
+  
+  Returns
+  -------
+  nothing
+  """
+
+  if key.endswith('jpg'):  # image file
+    content_type = 'image/jpeg'
+  else:  # default:
+    content_type = 'application/octet-stream'
+
+  client.upload_file(local_filename,
+                     bucket_name,
+                     key,
+                     ExtraArgs={
+                       'ACL': 'public-read',
+                       'ContentType': content_type
+                     },
+                     Config=transfer_config)
+
+
+###################################################################
+#
+# upload_files
+#
+def upload_files(local_filenames, bucket, keys, max_workers=upload_workers):
+  """
+  Uploads several files to an S3 bucket concurrently, as if by
+  calling upload_file() on each (local_filename, key) pair
+
+  Parameters
+  ----------
+  local_filenames : names of local files to upload, 
+  bucket : S3 Bucket to upload to,
+  keys : objects' names in the bucket after upload, one per file,
+  max_workers : maximum # of files uploaded at the same time
+  
+  Returns
+  -------
+  list with, for each file in order, the key that was passed in
+  or None if that file's upload failed
+  """
+
+  #
+  # bucket resources aren't thread-safe, so the workers share
+  # the underlying client instead:
+  #
+  client = bucket.meta.client
+  bucket_name = bucket.name
+
+  def upload(local_filename, key):
+    try:
+      put_file(client, bucket_name, local_filename, key)
+      return key
+
+    except Exception as e:
+      logging.error("awss3.upload_files() failed:")
+      logging.error(e)
+      return None
+
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    return list(executor.map(upload, local_filenames, keys))
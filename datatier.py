@@ -9,6 +9,7 @@
 #
 
 import pymysql
+import pymysql.cursors
 import logging
 
 
@@ -51,6 +52,36 @@ def get_dbConn(endpoint, portnum, username, pwd, dbname):
     return None
 
 
+##################################################################
+#
+# ping_dbConn:
+#
+# Checks that a database connection is still alive, transparently
+# reconnecting (with the original login info) if the server has
+# dropped it.
+#
+def ping_dbConn(dbConn):
+  """
+  Checks the database connection, reconnecting if needed
+
+  Parameters
+  ----------
+  dbConn : the database connection
+
+  Returns
+  -------
+  True if the connection is usable, False upon an error
+  """
+  try:
+    dbConn.ping(reconnect=True)
+    return True
+
+  except Exception as e:
+    logging.error("datatier.ping_dbConn() failed:")
+    logging.error(e)
+    return False
+
+
 ##################################################################
 #
 # retrieve_one_row:
@@ -145,6 +176,75 @@ def retrieve_all_rows(dbConn, sql, parameters=[]):
     dbCursor.close()
 
 
+##################################################################
+#
+# RowStreamError:
+#
+# Raised by the iterator from iter_rows() when the database
+# fails partway through streaming the rows.
+#
+class RowStreamError(Exception):
+  pass
+
+
+##################################################################
+#
+# iter_rows:
+#
+# Given a database connection and an SQL Select query,
+# executes this query against the database and returns an
+# iterator over the rows (tuples) retrieved by the query.
+# Rows are streamed from the server as the iterator is
+# consumed rather than buffered all at once, so memory use
+# does not grow with the size of the result. The query can
+# be parameterized using %s, in which case pass the values
+# as a list [value1, value2, ...]
+#
+def iter_rows(dbConn, sql, parameters=[]):
+  """
+  Executes an sql SELECT query against the database connection
+  and returns an iterator that streams the rows as tuples
+
+  Parameters
+  __________
+  dbConn : the database connection, 
+  sql : the SQL SELECT query (can be parameterized with %s),
+  parameters: optional list of values if parameterized
+
+  Returns
+  _______
+  Iterator over the rows (yields nothing if SELECT retrieves no
+  data) or None upon an error; if the connection fails while
+  rows are being streamed, the iterator logs the error and
+  raises RowStreamError
+  """
+
+  dbCursor = dbConn.cursor(pymysql.cursors.SSCursor)
+
+  try:
+    dbCursor.execute(sql, parameters)
+
+  except Exception as e:
+    dbCursor.close()
+    logging.error("datatier.iter_rows() failed:")
+    logging.error(e)
+    return None
+
+  def rows():
+    try:
+      yield from dbCursor
+
+    except Exception as e:
+      logging.error("datatier.iter_rows() failed:")
+      logging.error(e)
+      raise RowStreamError(e) from e
+
+    finally:
+      dbCursor.close()
+
+  return rows()
+
+
 ###############################################################
 #
 # perform_action:
@@ -192,3 +292,120 @@ def perform_action(dbConn, sql, parameters=[]):
 
   finally:
     dbCursor.close()
+
+
+###############################################################
+#
+# perform_insert:
+#
+# Given a database connection and an SQL insert query,
+# executes the insert and returns the auto-increment id
+# generated for the new row. The id comes back with the
+# query's result, so no "select LAST_INSERT_ID()" round-trip
+# is needed. The query can be parameterized using %s, in
+# which case pass the values as a list [value1, value2, ...]
+#
+def perform_insert(dbConn, sql, parameters=[]):
+  """
+  Executes an sql INSERT query against the database connection
+  and returns the id generated for the new row
+
+  Parameters
+  __________
+  dbConn : the database connection, 
+  sql : the SQL INSERT query (can be parameterized with %s),
+  parameters: optional list of values if parameterized
+
+  Returns
+  _______
+  auto-increment id of the inserted row or -1 upon an error
+  """
+
+  dbCursor = dbConn.cursor()
+
+  try:
+    dbCursor.execute(sql, parameters)
+    dbConn.commit()
+    return dbCursor.lastrowid
+
+  except Exception as e:
+    dbConn.rollback()
+    logging.error("datatier.perform_insert() failed:")
+    logging.error(e)
+    return -1
+
+  finally:
+    dbCursor.close()
+
+
+###############################################################
+#
+# perform_insert_many:
+#
+# Given a database connection, an SQL insert query of the
+# form "insert into ... values(%s, ...)", and a list of
+# parameter lists, inserts all the rows using multi-row
+# INSERTs and returns the ids generated for them. pymysql
+# splits a multi-row INSERT into several statements once its
+# text would exceed the cursor's max_stmt_length (about 1 MB),
+# and only the first id of each statement is reported back,
+# so the rows are sent in batches that each fit in one
+# statement. Ids within one multi-row INSERT are consecutive.
+#
+def perform_insert_many(dbConn, sql, rows):
+  """
+  Executes an sql INSERT query once per parameter list, batched
+  into as few multi-row statements as possible, and returns the
+  ids generated for the inserted rows
+
+  Parameters
+  __________
+  dbConn : the database connection, 
+  sql : the SQL INSERT query (parameterized with %s),
+  rows: list of parameter lists, one per row to insert
+
+  Returns
+  _______
+  list of (first id, # of rows) pairs, one per statement, where
+  the statement's rows got ids first, first+1, ...; empty if
+  rows is empty, or None upon an error
+  """
+
+  dbCursor = dbConn.cursor()
+
+  try:
+    #
+    # group rows into statement-sized batches; each row's full
+    # single-row statement is an upper bound on what that row
+    # adds to a multi-row one:
+    #
+    batches = []
+    batch = []
+    size = 0
+    for row in rows:
+      rowsize = len(dbCursor.mogrify(sql, row).encode(dbConn.encoding, "surrogateescape"))
+      if batch and size + rowsize > dbCursor.max_stmt_length:
+        batches.append(batch)
+        batch = []
+        size = 0
+      batch.append(row)
+      size += rowsize
+    if batch:
+      batches.append(batch)
+
+    ids = []
+    for batch in batches:
+      dbCursor.executemany(sql, batch)
+      ids.append((dbCursor.lastrowid, len(batch)))
+
+    dbConn.commit()
+    return ids
+
+  except Exception as e:
+    dbConn.rollback()
+    logging.error("datatier.perform_insert_many() failed:")
+    logging.error(e)
+    return None
+
+  finally:
+    dbCursor.close()
@@ -13,17 +13,183 @@
 import datatier  # MySQL database access
 import awsutil  # helper functions for AWS
 import boto3  # Amazon AWS
+from botocore.config import Config  # boto3 client settings
 
 import uuid
 import pathlib
 import logging
 import sys
 import os
+import time
+import functools
+import contextlib
 
 from configparser import ConfigParser
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import matplotlib.pyplot as plt
-import matplotlib.image as img
+import numpy as np
+from PIL import Image
+
+# for per-command timings (see timer):
+logger = logging.getLogger("photoapp")
+
+
+###################################################################
+#
+# SQL queries
+#
+_SQL_STATS = """
+  select
+  (select count(*) from users) as s1,
+  (select count(*) from assets) as s2;
+"""
+
+_SQL_USERS = """
+  select * from users order by userid desc
+"""
+
+_SQL_ASSETS = """
+  select * from assets order by assetid desc
+"""
+
+#
+# assetid is the primary key, and InnoDB stores rows in the
+# primary key's B-tree, so this is already a single index probe
+# (a secondary "covering" index would only duplicate it):
+#
+_SQL_ASSET_LOOKUP = """
+  select bucketkey, assetname from assets where assetid = %s
+"""
+
+_SQL_USER_FOLDER = """
+  select bucketfolder from users where userid = %s limit 1
+"""
+
+_SQL_INSERT_ASSET = """
+  INSERT INTO 
+  assets(userid, assetname, bucketkey)
+  values(%s, %s, %s)
+"""
+
+_SQL_INSERT_USER = """
+  INSERT INTO 
+  users(email, lastname, firstname, bucketfolder)
+  values(%s, %s, %s, %s)
+"""
+
+
+###################################################################
+#
+# AppConfig
+#
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+  """
+  Settings read from the config file at startup
+  
+  Attributes
+  ----------
+  bucket_name: S3 bucket name,
+  endpoint: RDS machine name,
+  port: RDS server port #,
+  user: RDS user name,
+  pwd: RDS user password,
+  db: RDS database name,
+  s3_accelerate: whether to use the S3 Transfer Acceleration
+                 endpoint (must be enabled on the bucket)
+  """
+  bucket_name: str
+  endpoint: str
+  port: int
+  user: str
+  pwd: str
+  db: str
+  s3_accelerate: bool = False
+
+
+###################################################################
+#
+# timer
+#
+@contextlib.contextmanager
+def timer(name):
+  """
+  Context manager that logs (at debug level, to the photoapp
+  logger) how long the code in its with block takes
+  
+  Parameters
+  ----------
+  name: what is being timed, for the log message
+  
+  Returns
+  -------
+  nothing
+  """
+  start = time.perf_counter_ns()
+  try:
+    yield
+  finally:
+    elapsed = (time.perf_counter_ns() - start) / 1_000_000
+    logger.debug("%s took %.1f ms", name, elapsed)
+
+
+###################################################################
+#
+# timed
+#
+def timed(func):
+  """
+  Decorator that times each call to the decorated function, as
+  if its body were in a timer() block. Only use it on functions
+  that don't wait for user input, or the timings mostly measure
+  the user's typing.
+  
+  Parameters
+  ----------
+  func: function to time
+  
+  Returns
+  -------
+  the wrapped function
+  """
+  @functools.wraps(func)
+  def wrapper(*args, **kwargs):
+    with timer(func.__name__ + "()"):
+      return func(*args, **kwargs)
+
+  return wrapper
+
+
+###################################################################
+#
+# new_id
+#
+def new_id():
+  """
+  Returns a new unique id, for naming user folders and assets in
+  S3, in UUID version 7 format: a millisecond timestamp followed
+  by random bits. Unlike version 4 UUIDs, new ids sort after
+  older ones, so inserts land at the end of the bucketfolder
+  index instead of at random pages.
+  
+  Parameters
+  ----------
+  None
+  
+  Returns
+  -------
+  the id as a string (36 characters, same as uuid4)
+  """
+  if hasattr(uuid, 'uuid7'):  # Python 3.14+
+    return str(uuid.uuid7())
+
+  ms = time.time_ns() // 1_000_000
+  value = (ms & ((1 << 48) - 1)) << 80 | int.from_bytes(os.urandom(10), 'big')
+  value = value & ~(0xF << 76) | (0x7 << 76)  # version 7
+  value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+  return str(uuid.UUID(int=value))
 
 
 ###################################################################
@@ -52,6 +218,7 @@ def prompt():
   print("   5 => download and display")
   print("   6 => upload")
   print("   7 => add user")
+  print("   8 => bulk upload")
 
   cmd = int(input())
   return cmd
@@ -61,42 +228,48 @@ def prompt():
 #
 # stats
 #
-def stats(bucketname, bucket, endpoint, dbConn):
+@timed
+def stats(bucketname, bucket, endpoint, dbConn, verify=False):
   """
   Prints out S3 and RDS info: bucket name, # of assets, RDS 
-  endpoint, and # of users and assets in the database
+  endpoint, and # of users and assets in the database. Assets
+  and S3 objects are 1:1, so the S3 asset count comes from the
+  database unless verify is set, in which case the bucket is
+  listed as well.
   
   Parameters
   ----------
   bucketname: S3 bucket name,
   bucket: S3 boto bucket object,
   endpoint: RDS machine name,
-  dbConn: open connection to MySQL server
+  dbConn: open connection to MySQL server,
+  verify: whether to also count the objects in S3
   
   Returns
   -------
   nothing
   """
+  row = datatier.retrieve_one_row(dbConn, _SQL_STATS)
+
   #
   # bucket info:
   #
   print("S3 bucket name:", bucketname)
 
-  assets = bucket.objects.all()
-  print("S3 assets:", len(list(assets)))
+  if verify:
+    count = awsutil.count_objects(bucket)
+    if count == -1:
+      print("S3 operation failed...")
+    else:
+      print("S3 assets:", count)
+  elif row:
+    print("S3 assets:", row[1])
 
   #
   # MySQL info:
   #
   print("RDS MySQL endpoint:", endpoint)
 
-  sql = """
-    select
-    (select count(*) from users) as s1,
-    (select count(*) from assets) as s2;
-  """
-
-  row = datatier.retrieve_one_row(dbConn, sql)
   if row is None:
     print("Database operation failed...")
   elif row == ():
@@ -105,10 +278,37 @@ def stats(bucketname, bucket, endpoint, dbConn):
     print("# of users:", row[0])
     print("# of assets:", row[1])
     
+###################################################################
+#
+# write_batched
+#
+def write_batched(chunks, batch_size=1000):
+  """
+  Writes strings to stdout, joining them into one write per
+  batch rather than one (or more) print() per string
+  
+  Parameters
+  ----------
+  chunks: iterable of strings to output (each ending in a newline),
+  batch_size: # of strings per write
+  
+  Returns
+  -------
+  nothing
+  """
+  batch = []
+  for chunk in chunks:
+    batch.append(chunk)
+    if len(batch) == batch_size:
+      sys.stdout.write("".join(batch))
+      batch.clear()
+  sys.stdout.write("".join(batch))
+
 ###################################################################
 #
 # users
 #
+@timed
 def users(dbConn):
   """
   Retrieves and outputs the users in the users
@@ -125,26 +325,23 @@ def users(dbConn):
   nothing
   """
 
-  sql = """
-    select * from users order by userid desc
-  """
-
-  rows = datatier.retrieve_all_rows(dbConn, sql)
+  rows = datatier.iter_rows(dbConn, _SQL_USERS)
   if rows is None:
     print("Database operation failed...")
-  elif rows == ():
-    print("Unexpected query failure...")
   else:
-    for i in range(len(rows)):
-      print("User id:",rows[i][0])
-      print("  Email:", rows[i][1])
-      print("  Name:", rows[i][2],",",rows[i][3])
-      print("  Folder:", rows[i][4])
+    try:
+      write_batched(f"User id: {row[0]}\n"
+                    f"  Email: {row[1]}\n"
+                    f"  Name: {row[2]} , {row[3]}\n"
+                    f"  Folder: {row[4]}\n" for row in rows)
+    except datatier.RowStreamError:  # failed partway through
+      print("Database operation failed...")
 
 ###################################################################
 #
 # assets
 #
+@timed
 def assets(dbConn):
   """
   Retrieves and outputs the assets in the assets
@@ -162,30 +359,114 @@ def assets(dbConn):
   nothing
   """
 
-  sql = """
-    select * from assets order by assetid desc
-  """
-
-  rows = datatier.retrieve_all_rows(dbConn, sql)
+  rows = datatier.iter_rows(dbConn, _SQL_ASSETS)
   if rows is None:
     print("Database operation failed...")
-  elif rows == ():
-    print("Unexpected query failure...")
   else:
-    for i in range(len(rows)):
-      print("Asset id:",rows[i][0])
-      print("  User id:", rows[i][1])
-      print("  Original name:", rows[i][2])
-      print("  Key name:", rows[i][3])
+    try:
+      write_batched(f"Asset id: {row[0]}\n"
+                    f"  User id: {row[1]}\n"
+                    f"  Original name: {row[2]}\n"
+                    f"  Key name: {row[3]}\n" for row in rows)
+    except datatier.RowStreamError:  # failed partway through
+      print("Database operation failed...")
+
+
+###################################################################
+#
+# decode_image
+#
+def decode_image(filename):
+  """
+  Decodes an image file for display. JPEGs larger than the
+  screen are decoded at a reduced scale, which is much faster
+  than a full decode.
+  
+  Parameters
+  ----------
+  filename: local image file
+  
+  Returns
+  -------
+  image pixels as a numpy array of uint8 (0-255)
+  """
+  image = Image.open(filename)
+  image.draft('RGB', (1024, 1024))
+  #
+  # palette images hold color indices, which imshow would draw
+  # through a colormap, so look up the actual colors (keeping any
+  # transparency); other modes imshow can't draw (CMYK, 1-bit,
+  # etc.) are converted to RGB(A) as well:
+  #
+  if image.mode in ('P', 'PA'):
+    has_alpha = image.mode == 'PA' or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+  elif image.mode == 'I' or image.mode.startswith('I;16'):
+    #
+    # 16-bit grayscale (Pillow opens 16-bit PNGs as mode I);
+    # convert() would clip these to 255, so scale them down:
+    #
+    pixels = np.clip(np.asarray(image), 0, 65535)
+    return (pixels >> 8).astype(np.uint8)
+  elif image.mode == 'F':
+    #
+    # floating point, in no fixed range, so stretch to 0-255
+    # (NaN pixels, which have no value, are drawn black):
+    #
+    pixels = np.asarray(image)
+    if np.isnan(pixels).all():
+      return np.zeros(pixels.shape, dtype=np.uint8)
+    low, high = np.nanmin(pixels), np.nanmax(pixels)
+    scale = 255 / (high - low) if high > low else 0
+    return np.nan_to_num((pixels - low) * scale).astype(np.uint8)
+  elif image.mode not in ('L', 'RGB', 'RGBA'):
+    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+  return np.asarray(image, dtype=np.uint8)
+
+
+# decodes images off the main thread:
+render_pool = ThreadPoolExecutor(max_workers=1)
+
+
+###################################################################
+#
+# local_stat
+#
+def local_stat(filename):
+  """
+  Returns the size and modification time of a local file
+  
+  Parameters
+  ----------
+  filename: local file
+  
+  Returns
+  -------
+  (size, mtime in ns) tuple, or None if the file doesn't exist
+  """
+  try:
+    st = os.stat(filename)
+    return (st.st_size, st.st_mtime_ns)
+  except OSError:
+    return None
 
 
 ###################################################################
 #
 # download & display
 #
+# asset id => bucket key, original name, and (size, mtime) of
+# the local copy (None until downloaded), for the most recently
+# used assets; the dict is kept in least to most recently used
+# order:
+#
+asset_cache = {}
+asset_cache_size = 1024
+
+
 def download(dbConn, bucket, display):
   """
-  Inputs an asset id, and then looks up that asset in the database, downloads the file, and renames it based on     the original filename.
+  Inputs an asset id, and then looks up that asset in the database and downloads the file, saving it under the original filename.
   
   Parameters
   ----------
@@ -199,26 +480,62 @@ def download(dbConn, bucket, display):
   nothing
   """
   print("Enter asset id>")
-  s = input()
-  
-  sql = """
-    select bucketkey, assetname from assets where assetid = %s
-  """
-  
-  row = datatier.retrieve_one_row(dbConn, sql, [s])
+  s = input().strip()
 
-  if row is None:
-    print("Database operation failed...")
-  elif row == ():
-    print("No such asset...")
-  else:
-    filename = awsutil.download_file(bucket, row[0])
-    os.rename(filename, row[1])
-    print("Downloaded from S3 and saved as '",row[1],"'")
-    if display == True:
-      image = img.imread(row[1])
-      plt.imshow(image)
-      plt.show()
+  #
+  # time the lookup and download, not the prompt or the display:
+  #
+  with timer("download()"):
+    #
+    # have we looked up (and maybe downloaded) this asset before?
+    #
+    cached = asset_cache.pop(s, None)
+
+    if cached is None:
+      row = datatier.retrieve_one_row(dbConn, _SQL_ASSET_LOOKUP, [s])
+
+      if row is None:
+        print("Database operation failed...")
+        return
+      elif row == ():
+        print("No such asset...")
+        return
+
+      if len(asset_cache) >= asset_cache_size:  # evict least recently used
+        del asset_cache[next(iter(asset_cache))]
+      cached = {"bucketkey": row[0], "assetname": row[1], "stat": None}
+
+    asset_cache[s] = cached  # (re)insert as most recently used
+
+    localname = cached["assetname"]
+
+    #
+    # assets never change once uploaded, so if we already downloaded
+    # this one and the local file is still the one we wrote (same
+    # size and modification time; another asset with the same name
+    # may have been saved over it since), skip the S3 GET:
+    #
+    if cached["stat"] is not None and local_stat(localname) == cached["stat"]:
+      print("Already downloaded as '", localname, "'")
+    else:
+      filename = awsutil.download_file(bucket, cached["bucketkey"], localname)
+      if filename is None:
+        print("Download from S3 failed...")
+        return
+      cached["stat"] = local_stat(localname)
+      print("Downloaded from S3 and saved as '", localname, "'")
+
+  if display == True:
+    #
+    # decode on the render thread while the main thread creates
+    # the figure (matplotlib must stay on the main thread); this
+    # only overlaps those two steps, and the prompt still returns
+    # once the window is closed:
+    #
+    future = render_pool.submit(decode_image, localname)
+    plt.figure()
+    plt.imshow(future.result(), vmin=0, vmax=255)
+    plt.show()
 
 ###################################################################
 #
@@ -241,35 +558,117 @@ def upload(dbConn, bucket):
   """
   print("Enter local file name>")
   s = input()
-  if os.path.exists(s) == False:
+  if not pathlib.Path(s).is_file():
     print("Local file '",s,"' does not exist...")
-    os.abort()
+    return
   print("Enter user id>")
-  id = input()
-  sql1 = """
-    select * from users where userid = %s
+  user_id = input()
+  with timer("upload()"):  # (not the prompts)
+    row1 = datatier.retrieve_one_row(dbConn, _SQL_USER_FOLDER, [user_id])
+    if row1 is None or row1 == ():
+      print("No such user...")
+      return
+
+    filename = row1[0]+'/'+new_id()+'.jpg'
+    key = awsutil.upload_file(s, bucket, filename)
+    print("Uploaded and stored in S3 as '", key, "'")
+
+    assetid = datatier.perform_insert(dbConn, _SQL_INSERT_ASSET, [user_id, s, key])
+    if assetid == -1:
+      print("Database operation failed...")
+      return
+    print("Recorded in RDS under asset id", assetid)
+
+
+###################################################################
+#
+# bulk upload
+#
+@timed
+def bulk_upload(dbConn, bucket, files, userid, folder):
   """
-  row1 = datatier.retrieve_one_row(dbConn, sql1, [id])
-  if row1 is None or row1 == ():
-    print("No such user...")
-    os.abort()
+  Uploads a list of local files to the given user's folder in S3,
+  several at a time, and then records all of the uploaded files
+  in the assets table with multi-row INSERTs.
 
-  filename = row1[4]+'/'+str(uuid.uuid4())+'.jpg'
-  key = awsutil.upload_file(s, bucket, filename)
-  print("Uploaded and stored in S3 as '", key, "'")
   
-  sql2 = """
-  INSERT INTO 
-  assets(userid, assetname, bucketkey)
-  values(%s, %s, %s)
+  Parameters
+  ----------
+
+  dbConn: open connection to MySQL server
+  bucket: S3 bucket object
+  files: names of local files to upload
+  userid: id of the user who owns the files
+  folder: the user's bucket folder
+  
+  Returns
+  -------
+  nothing
   """
-  row2 = datatier.perform_action(dbConn, sql2, [id, s, key])
+  keys = [folder+'/'+new_id()+'.jpg' for f in files]
+  results = awsutil.upload_files(files, bucket, keys)
+
+  rows = []
+  for f, key in zip(files, results):
+    if key is None:
+      print("Failed to upload '", f, "'")
+    else:
+      rows.append([userid, f, key])
+  print("Uploaded", len(rows), "of", len(files), "files to S3")
+
+  if len(rows) == 0:
+    return
+
+  ids = datatier.perform_insert_many(dbConn, _SQL_INSERT_ASSET, rows)
+  if ids is None:
+    print("Database operation failed...")
+    return
+  for firstid, count in ids:
+    print("Recorded in RDS under asset ids", firstid, "to", firstid + count - 1)
+
+
+###################################################################
+#
+# upload many
+#
+def uploadmany(dbConn, bucket):
+  """
+  Inputs a user id and the names of several local files, one per
+  line and ending with a blank line, and then bulk uploads them.
+
+  
+  Parameters
+  ----------
+
+  dbConn: open connection to MySQL server
+  bucket: S3 bucket object
   
-  sql3 = """
-    select LAST_INSERT_ID()
+  Returns
+  -------
+  nothing
   """
-  row3 = datatier.retrieve_one_row(dbConn, sql3)
-  print("Recorded in RDS under asset id", row3[0])
+  print("Enter user id>")
+  userid = input()
+  row1 = datatier.retrieve_one_row(dbConn, _SQL_USER_FOLDER, [userid])
+  if row1 is None or row1 == ():
+    print("No such user...")
+    return
+
+  print("Enter local file names, one per line (blank line to finish)>")
+  files = []
+  s = input()
+  while s != "":
+    if not pathlib.Path(s).is_file():
+      print("Local file '", s, "' does not exist, skipping...")
+    else:
+      files.append(s)
+    s = input()
+
+  if len(files) == 0:
+    print("No files to upload...")
+    return
+
+  bulk_upload(dbConn, bucket, files, userid, row1[0])
 
 
 ###################################################################
@@ -297,20 +696,32 @@ def adduser(dbConn):
   print("Enter user's first (given) name>")
   fn = input()
 
-  folder = uuid.uuid4()
-  
-  sql1 = """
-    INSERT INTO 
-    users(email, lastname, firstname, bucketfolder)
-    values(%s, %s, %s, %s)
+  with timer("adduser()"):  # (not the prompts)
+    folder = new_id()
+
+    userid = datatier.perform_insert(dbConn, _SQL_INSERT_USER, [email, ln, fn, folder])
+    if userid == -1:
+      print("Database operation failed...")
+      return
+    print("Recorded in RDS under user id", userid)
+
+###################################################################
+#
+# unknown
+#
+def unknown():
   """
-  row1 = datatier.perform_action(dbConn, sql1, [email, ln, fn, folder])
+  Handles a command number with no handler
   
-  sql2 = """
-    select LAST_INSERT_ID();
+  Parameters
+  ----------
+  None
+  
+  Returns
+  -------
+  nothing
   """
-  row2 = datatier.retrieve_one_row(dbConn, sql2)
-  print("Recorded in RDS under asset id", row2[0])
+  print("** Unknown command, try again...")
 
 #########################################################################
 # main
@@ -318,8 +729,23 @@ def adduser(dbConn):
 print('** Welcome to PhotoApp **')
 print()
 
+# count S3 objects directly in stats (slow for large buckets)?
+verify = '--verify' in sys.argv[1:]
+
+# debugging? (keeps tracebacks and turns on --timing)
+debug = bool(os.environ.get('PHOTOAPP_DEBUG'))
+
+# log how long each command takes? (only our own logger, so
+# boto3, urllib3, etc. stay quiet):
+if debug or '--timing' in sys.argv[1:]:
+  handler = logging.StreamHandler()
+  handler.setFormatter(logging.Formatter("** %(message)s"))
+  logger.addHandler(handler)
+  logger.setLevel(logging.DEBUG)
+
 # eliminate traceback so we just get error message:
-sys.tracebacklimit = 0
+if not debug:
+  sys.tracebacklimit = 0
 
 #
 # what config file should we use for this session?
@@ -354,52 +780,83 @@ boto3.setup_default_session(profile_name=s3_profile)
 
 configur = ConfigParser()
 configur.read(config_file)
-bucketname = configur.get('s3', 'bucket_name')
 
-s3 = boto3.resource('s3')
-bucket = s3.Bucket(bucketname)
+cfg = AppConfig(bucket_name=configur['s3']['bucket_name'],
+                endpoint=configur['rds']['endpoint'],
+                port=int(configur['rds']['port_number']),
+                user=configur['rds']['user_name'],
+                pwd=configur['rds']['user_pwd'],
+                db=configur['rds']['db_name'],
+                s3_accelerate=configur.getboolean('s3',
+                                                  'use_accelerate_endpoint',
+                                                  fallback=False))
+del configur
+
+s3 = boto3.resource(
+  's3',
+  config=Config(max_pool_connections=awsutil.max_pool_connections,
+                s3={'use_accelerate_endpoint': cfg.s3_accelerate}))
+bucket = s3.Bucket(cfg.bucket_name)
 
 #
 # now let's connect to our RDS MySQL server:
 #
-endpoint = configur.get('rds', 'endpoint')
-portnum = int(configur.get('rds', 'port_number'))
-username = configur.get('rds', 'user_name')
-pwd = configur.get('rds', 'user_pwd')
-dbname = configur.get('rds', 'db_name')
 
-dbConn = datatier.get_dbConn(endpoint, portnum, username, pwd, dbname)
+# reopen the connection once it is this old (seconds):
+db_recycle = 1800
+
+dbConn = datatier.get_dbConn(cfg.endpoint, cfg.port, cfg.user, cfg.pwd, cfg.db)
+dbOpened = time.monotonic()
 
 if dbConn is None:
   print('**ERROR: unable to connect to database, exiting')
   sys.exit(0)
 
+#
+# command number => handler:
+#
+handlers = {
+  1: lambda: stats(cfg.bucket_name, bucket, cfg.endpoint, dbConn, verify),
+  2: lambda: users(dbConn),
+  3: lambda: assets(dbConn),
+  4: lambda: download(dbConn, bucket, False),
+  5: lambda: download(dbConn, bucket, True),
+  6: lambda: upload(dbConn, bucket),
+  7: lambda: adduser(dbConn),
+  8: lambda: uploadmany(dbConn, bucket),
+}
+
 #
 # main processing loop:
 #
-cmd = prompt()
-
-while cmd != 0:
-  if cmd == 1:
-    stats(bucketname, bucket, endpoint, dbConn)
-  elif cmd == 2:
-    users(dbConn)
-  elif cmd == 3:
-    assets(dbConn)
-  elif cmd == 4:
-    download(dbConn, bucket, False)
-  elif cmd == 5:
-    download(dbConn, bucket, True)
-  elif cmd == 6:
-    upload(dbConn, bucket)
-  elif cmd == 7:
-    adduser(dbConn)
-  else:
-    print("** Unknown command, try again...")
-    
-  
+try:
   cmd = prompt()
 
+  while cmd != 0:
+    #
+    # make sure the connection is fresh and alive before each
+    # command, so a dropped connection doesn't end the session:
+    #
+    if time.monotonic() - dbOpened > db_recycle:
+      dbConn.close()
+      dbConn = datatier.get_dbConn(cfg.endpoint, cfg.port, cfg.user, cfg.pwd, cfg.db)
+      dbOpened = time.monotonic()
+      if dbConn is None:
+        print('**ERROR: unable to reconnect to database, exiting')
+        sys.exit(0)
+    elif not datatier.ping_dbConn(dbConn):
+      print('**ERROR: lost connection to database, exiting')
+      sys.exit(0)
+
+    handlers.get(cmd, unknown)()
+
+    cmd = prompt()
+
+except (KeyboardInterrupt, EOFError):  # Ctrl-C / Ctrl-D at a prompt
+  print()
+
+dbConn.close()
+
 #
 # done
 #